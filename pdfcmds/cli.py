@@ -1,10 +1,17 @@
 """Command-line interface for pdfcmds."""
 
+import asyncio
+import functools
+import glob
 import os
 import re
 import shutil
 import sys
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from types import ModuleType
 
 import click
 
@@ -19,6 +26,53 @@ WINDOWS_TESSERACT_PATHS = [
     Path(os.environ.get("ProgramFiles(x86)", ""), "Tesseract-OCR", "tesseract.exe"),
 ]
 
+# Markdown image link target starting with a Windows drive, e.g. "](C:\"
+_DRIVE_LINK_RE = re.compile(r"\]\([A-Za-z]:[\\/]")
+
+
+@functools.lru_cache(maxsize=1)
+def find_tesseract() -> Path | None:
+    """Find Tesseract executable, checking PATH and common Windows locations.
+    This version does not add to the environment path.
+
+    The result is cached; call find_tesseract.cache_clear() to search again."""
+    # First check PATH
+    path_result = shutil.which("tesseract")
+    if path_result:
+        return Path(path_result)
+
+    # On Windows, check common installation locations
+    if sys.platform == "win32":
+        return _find_windows_tesseract()
+
+    return None
+
+
+def _find_windows_tesseract() -> Path | None:
+    """Return the first of WINDOWS_TESSERACT_PATHS that exists.
+
+    Lists each candidate directory once instead of checking every path,
+    since several candidates usually share a directory.
+    """
+    listings: dict[Path, set[str]] = {}
+    for path in WINDOWS_TESSERACT_PATHS:
+        parent = path.parent
+        if parent not in listings:
+            try:
+                with os.scandir(parent) as entries:
+                    # Windows file names are case-insensitive
+                    listings[parent] = {entry.name.lower() for entry in entries}
+            except OSError:
+                listings[parent] = set()
+        if path.name.lower() in listings[parent]:
+            return path
+    return None
+
+
+# Set once the environment has been configured for Tesseract
+_TESSERACT_CONFIGURED = False
+_TESSERACT_PATH: Path | None = None
+
 # definining _find_tesseract_early() here as it may be that found on import of pymupdf/pymupdf.layout
 
 def _find_tesseract_early() -> Path | None:
@@ -27,30 +81,26 @@ def _find_tesseract_early() -> Path | None:
     if find in common windows locations, will add the the environment
     os.environ["PATH"] if it is not already there
 
-    Returns the path to tesseract executable if found.
+    Returns the path to tesseract executable if found. Only the first call
+    does any work; later calls return the same path.
 
     """
-    tesseract_path = None
+    global _TESSERACT_CONFIGURED, _TESSERACT_PATH
+    if _TESSERACT_CONFIGURED:
+        return _TESSERACT_PATH
 
-    # First check PATH
-    path_result = shutil.which("tesseract")
-    if path_result:
-        tesseract_path = Path(path_result)
-    elif sys.platform == "win32":
-        # Check common Windows locations
-        for path in WINDOWS_TESSERACT_PATHS:
-            if path.exists():
-                tesseract_path = path
-                break
+    tesseract_path = find_tesseract()
 
     if tesseract_path:
         tesseract_dir = tesseract_path.parent
 
         # On Windows, add to PATH if not already there
-        if sys.platform == "win32" and not path_result:
-            os.environ["PATH"] = (
-                str(tesseract_dir) + os.pathsep + os.environ.get("PATH", "")
-            )
+        path_env = os.environ.get("PATH", "")
+        if (
+            sys.platform == "win32"
+            and str(tesseract_dir).lower() not in path_env.lower()
+        ):
+            os.environ["PATH"] = str(tesseract_dir) + os.pathsep + path_env
 
         # Always set TESSDATA_PREFIX if not already set (needed by pymupdf)
         if "TESSDATA_PREFIX" not in os.environ:
@@ -58,66 +108,319 @@ def _find_tesseract_early() -> Path | None:
             if tessdata_dir.exists():
                 os.environ["TESSDATA_PREFIX"] = str(tessdata_dir)
 
+    _TESSERACT_PATH = tesseract_path
+    _TESSERACT_CONFIGURED = True
     return tesseract_path
 
 
+def _reset_for_tests() -> None:
+    """Forget Tesseract discovery and configuration so they run again."""
+    global _TESSERACT_CONFIGURED, _TESSERACT_PATH
+    _TESSERACT_CONFIGURED = False
+    _TESSERACT_PATH = None
+    find_tesseract.cache_clear()
+
+
 # Configure Tesseract before importing pymupdf (which may use it)
 _find_tesseract_early()
 
-# Activate PyMuPDF Layout before importing pymupdf4llm for enhanced layout detection
-# it is possible this could be moved before the Tesseract configuration above
-import pymupdf.layout  # noqa: E402
 
-pymupdf.layout.activate()
+@functools.lru_cache(None)
+def _ensure_pymupdf() -> ModuleType:
+    """Import pymupdf4llm on first use, at most once per process.
 
-import pymupdf4llm  # noqa:E402
+    Importing pymupdf and loading the layout model is slow, so commands
+    that do not convert anything (check, --help) skip it entirely.
+    """
+    # Activate PyMuPDF Layout before importing pymupdf4llm for enhanced layout
+    # detection. Tesseract was configured above, before any pymupdf import.
+    import pymupdf.layout
 
+    pymupdf.layout.activate()
 
-def _try_relative(img_path: str, output_dir: Path) -> str:
-    """Try to convert an image path to be relative to output_dir."""
-    try:
-        abs_path = Path(img_path)
-        if abs_path.is_absolute():
-            return abs_path.relative_to(output_dir).as_posix()  # I love pathlib so much
-    except ValueError:
-        pass
+    import pymupdf4llm
+
+    return pymupdf4llm
+
+
+def _try_relative(img_path: str, output_dir: str) -> str:
+    """Try to convert an image path to be relative to output_dir.
+
+    output_dir must be an absolute, normalized path. This is pure string
+    work, as it runs for every image link in the document.
+    """
+    if os.path.isabs(img_path):
+        norm_path = os.path.normpath(img_path)
+        prefix = output_dir.rstrip(os.sep) + os.sep
+        if os.path.normcase(norm_path).startswith(os.path.normcase(prefix)):
+            return norm_path[len(prefix) :].replace(os.sep, "/")
     return img_path
 
 
-def _make_image_paths_relative(md_text: str, output_dir: Path) -> str:
-    """Convert absolute image paths in markdown to relative paths."""
-    # Match markdown image syntax: ![alt](path)
-    return re.sub(
-        r"!\[([^\]]*)\]\(([^)]+)\)",
-        lambda m: f"![{m.group(1)}]({_try_relative(m.group(2), output_dir)})",
-        md_text,
+def _rewrite_image_links(md_text: str, rewrite: Callable[[str], str]) -> str:
+    r"""Apply rewrite() to the path of every markdown image link ![alt](path).
+
+    Uses plain string scanning rather than a regex, matching exactly what
+    the pattern ``!\[([^\]\n]*)\]\(([^)\n]+)\)`` would. Links never span
+    lines, which keeps every search within a single line.
+    """
+    parts = []
+    pos = 0  # start of the text not yet copied to parts
+    line_end = -1
+    start = md_text.find("![")
+    while start != -1:
+        if line_end < start:
+            line_end = md_text.find("\n", start)
+            if line_end == -1:
+                line_end = len(md_text)
+        close = md_text.find("]", start + 2, line_end)
+        if close == -1:
+            # No link can start on the rest of this line
+            start = md_text.find("![", line_end + 1)
+            continue
+        if md_text.startswith("(", close + 1):
+            end = md_text.find(")", close + 2, line_end)
+            if end == -1:
+                start = md_text.find("![", line_end + 1)
+                continue
+            if end > close + 2:
+                parts.append(md_text[pos : close + 2])
+                parts.append(rewrite(md_text[close + 2 : end]))
+                pos = end
+                start = md_text.find("![", end + 1)
+                continue
+        # Any link starting before this "]" would end at it too, so skip past it
+        start = md_text.find("![", close + 1)
+
+    if not parts:
+        return md_text
+    parts.append(md_text[pos:])
+    return "".join(parts)
+
+
+def _has_absolute_image_links(md_text: str) -> bool:
+    """Cheap check for links that start with a POSIX, UNC or drive path."""
+    return (
+        "](/" in md_text
+        or "](\\" in md_text
+        or _DRIVE_LINK_RE.search(md_text) is not None
     )
 
 
-def _move_images_to_correct_dir(
-    pdf_dir: Path, image_dir: Path, md_text: str, existing_images: set[Path]
-) -> str:
-    """Move images from PDF directory to specified image_dir and update markdown.
+def _list_pngs(dir_: str | Path) -> set[str]:
+    """Return the names of the PNG files in dir_."""
+    with os.scandir(dir_) as entries:
+        return {e.name for e in entries if e.name.endswith(".png") and e.is_file()}
+
+
+def _rewrite_and_move_images(
+    pdf_dir: str | Path,
+    image_dir: str | Path,
+    output_dir: str | Path | None,
+    pages: list[str],
+    existing_images: set[str],
+    input_name: str | None = None,
+) -> list[str]:
+    """Move images from PDF directory to image_dir and fix up markdown links.
 
     Workaround for pymupdf-layout bug where image_path parameter is ignored.
     Images are written to the PDF's directory instead of the specified path.
+    Only new images are moved; if input_name is given, only those that
+    pymupdf-layout named after it ({input_name}-{page:04d}-{index:02d}.png).
+
+    If output_dir is given, absolute image paths are also made relative to
+    it. All links are rewritten in a single pass over each page's markdown.
+    """
+    pdf_dir, image_dir = os.fspath(pdf_dir), os.fspath(image_dir)
+
+    # Find new images created by to_markdown(). Match the full name, since a
+    # prefix check would also claim images of e.g. "a.pdf-x.pdf" for "a.pdf".
+    new_images = _list_pngs(pdf_dir) - existing_images
+    if input_name is not None:
+        pattern = re.compile(re.escape(input_name) + r"-\d{4}-\d{2}\.png")
+        new_images = {name for name in new_images if pattern.fullmatch(name)}
+
+    # Move each new image to the target directory. A plain rename is enough
+    # on the same filesystem; shutil.move handles everything else.
+    same_fs = bool(new_images) and os.stat(pdf_dir).st_dev == os.stat(image_dir).st_dev
+    for name in new_images:
+        src, dest = os.path.join(pdf_dir, name), os.path.join(image_dir, name)
+        if same_fs:
+            try:
+                os.rename(src, dest)
+                continue
+            except OSError:
+                pass
+        shutil.move(src, dest)
+
+    # Map each old path straight to its final form
+    moved = {
+        os.path.join(pdf_dir, name): os.path.join(image_dir, name)
+        for name in new_images
+    }
+    if output_dir is None:
+        if not moved:
+            return pages
+        return [
+            _rewrite_image_links(md_text, lambda path: moved.get(path, path))
+            for md_text in pages
+        ]
+
+    output_dir = os.fspath(output_dir)
+    return [
+        _rewrite_image_links(
+            md_text, lambda path: _try_relative(moved.get(path, path), output_dir)
+        )
+        if moved or _has_absolute_image_links(md_text)
+        else md_text
+        for md_text in pages
+    ]
+
+
+def _convert_pages(
+    input_file: Path,
+    output: Path | None = None,
+    write_images: bool = False,
+    embed_images: bool = False,
+    image_dir: Path | None = None,
+) -> list[str]:
+    """Convert a single PDF to markdown text, one string per page.
+
+    Joining the pages gives the full document. ``output`` is only used to
+    make extracted image paths relative to the markdown file; nothing is
+    written to it here.
     """
-    # Find new images created by to_markdown()
-    current_images = set(pdf_dir.glob("*.png"))
-    new_images = current_images - existing_images
+    # Resolve to absolute path to avoid pymupdf-layout path concatenation issues.
+    # Plain strings are used from here on; everything below wants str anyway.
+    input_str = os.path.realpath(input_file)
+    pdf_dir, input_name = os.path.split(input_str)
+
+    kwargs = {}
+    existing_images = set()
+
+    if embed_images:
+        kwargs["embed_images"] = True
+    elif write_images:
+        kwargs["write_images"] = True
+        # Default image directory is {input_stem}_images
+        if image_dir is None:
+            image_dir_str = os.path.join(
+                pdf_dir, f"{os.path.splitext(input_name)[0]}_images"
+            )
+        else:
+            image_dir_str = os.path.realpath(image_dir)
+        # Create the image directory if it doesn't exist
+        os.makedirs(image_dir_str, exist_ok=True)
+        kwargs["image_path"] = image_dir_str
+        # Record existing images before conversion (for workaround)
+        existing_images = _list_pngs(pdf_dir)
+
+    pymupdf4llm = _ensure_pymupdf()
+    chunks = pymupdf4llm.to_markdown(input_str, page_chunks=True, **kwargs)
+    pages = [chunk["text"] for chunk in chunks]
+
+    # Workaround: pymupdf-layout ignores image_path and writes to PDF directory
+    # Move images to the correct location, and convert absolute image paths
+    # to relative when writing to a file (pymupdf-layout uses absolute paths).
+    # Images are named after the input file, so other conversions running
+    # concurrently in the same directory keep their own images.
+    if write_images:
+        output_dir = None
+        if output:
+            # Resolved once per document, like the image paths compared to it
+            output_dir = os.path.realpath(os.path.dirname(os.path.abspath(output)))
+        pages = _rewrite_and_move_images(
+            pdf_dir,
+            image_dir_str,
+            output_dir,
+            pages,
+            existing_images,
+            input_name,
+        )
 
-    # Move each new image to the target directory
-    for img in new_images:
-        dest = image_dir / img.name
-        shutil.move(str(img), str(dest))
+    return pages
 
-    # Update markdown to reference new locations
-    for img in new_images:
-        old_path = str(img)
-        new_path = str(image_dir / img.name)
-        md_text = md_text.replace(old_path, new_path)
 
-    return md_text
+def convert_to_markdown(
+    input_file: Path,
+    output: Path | None = None,
+    write_images: bool = False,
+    embed_images: bool = False,
+    image_dir: Path | None = None,
+) -> str:
+    """Convert a single PDF to markdown text.
+
+    This is what the convert command runs, without the CLI around it.
+    Nothing is written to ``output``; it is only used to make extracted
+    image paths relative.
+    """
+    return "".join(
+        _convert_pages(input_file, output, write_images, embed_images, image_dir)
+    )
+
+
+def _write_markdown(pages: list[str], output: Path) -> None:
+    """Write markdown pages to output as UTF-8, one page at a time.
+
+    Writes straight to the file descriptor, skipping Python's I/O buffers.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(output, flags, 0o666)
+    try:
+        for page in pages:
+            data = memoryview(page.encode("utf-8"))
+            while data:
+                data = data[os.write(fd, data) :]
+    finally:
+        os.close(fd)
+
+
+def _convert_to_file(
+    input_file: Path,
+    output: Path,
+    write_images: bool = False,
+    embed_images: bool = False,
+    image_dir: Path | None = None,
+) -> None:
+    """Convert a single PDF and write the markdown to output."""
+    _write_markdown(
+        _convert_pages(input_file, output, write_images, embed_images, image_dir),
+        output,
+    )
+
+
+# PyMuPDF is not thread-safe, so threaded conversions must take turns
+_CONVERT_LOCK = threading.Lock()
+
+
+def _convert_locked(*args) -> str:
+    """Run convert_to_markdown while holding the conversion lock."""
+    with _CONVERT_LOCK:
+        return convert_to_markdown(*args)
+
+
+async def convert_to_markdown_async(
+    input_file: Path,
+    output: Path | None = None,
+    write_images: bool = False,
+    embed_images: bool = False,
+    image_dir: Path | None = None,
+) -> str:
+    """Convert a PDF to markdown text without blocking the event loop.
+
+    The conversion runs in a worker thread, for use from async applications
+    such as web servers. Nothing is written to ``output``; it is only used
+    to make extracted image paths relative.
+    """
+    return await asyncio.to_thread(
+        _convert_locked, input_file, output, write_images, embed_images, image_dir
+    )
+
+
+def _init_worker() -> None:
+    """Prepare a batch worker process for conversions."""
+    _find_tesseract_early()
+    _ensure_pymupdf()
 
 
 @click.group()
@@ -182,7 +485,6 @@ def convert(
             "--write-images and --embed-images are mutually exclusive"
         )
 
-    # Resolve to absolute path to avoid pymupdf-layout path concatenation issues
     input_file = input_file.resolve()
 
     if output_format in ("markdown", "md"):
@@ -190,76 +492,153 @@ def convert(
         if output is None and not use_stdout:
             output = input_file.with_suffix(".md")
 
-        kwargs = {}
-        pdf_dir = input_file.parent
-        existing_images = set()
-
-        if embed_images:
-            kwargs["embed_images"] = True
-        elif write_images:
-            kwargs["write_images"] = True
-            # Default image directory is {input_stem}_images
-            if image_dir is None:
-                image_dir = pdf_dir / f"{input_file.stem}_images"
-            else:
-                image_dir = image_dir.resolve()
-            # Create the image directory if it doesn't exist
-            image_dir.mkdir(parents=True, exist_ok=True)
-            kwargs["image_path"] = str(image_dir)
-            # Record existing images before conversion (for workaround)
-            existing_images = set(pdf_dir.glob("*.png"))
-
-        md_text = pymupdf4llm.to_markdown(str(input_file), **kwargs)
-
-        # Workaround: pymupdf-layout ignores image_path and writes to PDF directory
-        # Move images to the correct location and update markdown paths
-        if write_images:
-            md_text = _move_images_to_correct_dir(
-                pdf_dir, image_dir, md_text, existing_images
-            )
-
-        # Convert absolute image paths to relative (pymupdf-layout uses absolute paths)
-        if write_images and output:
-            md_text = _make_image_paths_relative(md_text, output.parent.resolve())
+        pages = _convert_pages(
+            input_file, output, write_images, embed_images, image_dir
+        )
 
         if use_stdout:
             # Write UTF-8 bytes directly to stdout to avoid Windows encoding issues
-            sys.stdout.buffer.write(md_text.encode("utf-8"))
+            for page in pages:
+                sys.stdout.buffer.write(page.encode("utf-8"))
         else:
-            output.write_text(md_text, encoding="utf-8")
+            _write_markdown(pages, output)
             click.echo(f"Converted to {output}", err=True)
 
 
-def find_tesseract() -> Path | None:
-    """Find Tesseract executable, checking PATH and common Windows locations.
-    This version does not add to the environment path"""
-    # First check PATH
-    path_result = shutil.which("tesseract")
-    if path_result:
-        return Path(path_result)
+@main.command("convert-batch")
+@click.argument(
+    "inputs", nargs=-1, type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.option(
+    "--glob",
+    "patterns",
+    multiple=True,
+    help="Glob pattern selecting PDFs to convert (may be repeated)",
+)
+@click.option(
+    "--to",
+    "output_format",
+    type=click.Choice(["markdown", "md"]),
+    required=True,
+    help="Output format",
+)
+@click.option(
+    "--output-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Directory for output files (defaults to each input's directory)",
+)
+@click.option(
+    "--write-images",
+    is_flag=True,
+    default=False,
+    help="Extract images to a directory per input (default: {input}_images)",
+)
+@click.option(
+    "--embed-images",
+    is_flag=True,
+    default=False,
+    help="Embed images as base64 in the markdown output",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Number of worker processes (default: one per CPU, at most one per input)",
+)
+def convert_batch(
+    inputs: tuple[Path, ...],
+    patterns: tuple[str, ...],
+    output_format: str,
+    output_dir: Path | None,
+    write_images: bool,
+    embed_images: bool,
+    workers: int | None,
+):
+    """Convert many PDFs in one invocation.
 
-    # On Windows, check common installation locations
-    if sys.platform == "win32":
-        for path in WINDOWS_TESSERACT_PATHS:
-            if path.exists():
-                return path
+    Avoids paying interpreter startup and layout model loading per file.
+    Conversions run in parallel worker processes.
+    """
+    if write_images and embed_images:
+        raise click.UsageError(
+            "--write-images and --embed-images are mutually exclusive"
+        )
 
-    return None
+    # Collect inputs from arguments and --glob patterns, dropping duplicates
+    candidates = list(inputs)
+    for pattern in patterns:
+        candidates.extend(Path(p) for p in sorted(glob.glob(pattern, recursive=True)))
+    input_files = list(dict.fromkeys(p.resolve() for p in candidates if p.is_file()))
+    if not input_files:
+        raise click.UsageError("No input files given")
+
+    if output_dir is not None:
+        output_dir = output_dir.resolve()
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    if workers is None:
+        workers = min(os.cpu_count() or 1, len(input_files))
+
+    if output_format in ("markdown", "md"):
+        jobs = []
+        # Inputs with the same stem would overwrite each other's output
+        sources: dict[Path, Path] = {}
+        for input_file in input_files:
+            target_dir = output_dir or input_file.parent
+            output = target_dir / f"{input_file.stem}.md"
+            if output in sources:
+                raise click.UsageError(
+                    f"{sources[output]} and {input_file} would both be "
+                    f"converted to {output}"
+                )
+            sources[output] = input_file
+            image_dir = None
+            if write_images and output_dir is not None:
+                image_dir = output_dir / f"{input_file.stem}_images"
+            jobs.append((input_file, output, write_images, embed_images, image_dir))
+
+        # A file that fails to convert is reported, not fatal to the batch
+        failures: list[tuple[Path, Exception]] = []
+        with click.progressbar(
+            length=len(jobs), label="Converting", file=sys.stderr
+        ) as bar:
+            if workers == 1:
+                # No point paying for a process pool
+                for job in jobs:
+                    try:
+                        _convert_to_file(*job)
+                    except Exception as e:
+                        failures.append((job[0], e))
+                    bar.update(1)
+            else:
+                with ProcessPoolExecutor(
+                    max_workers=workers, initializer=_init_worker
+                ) as pool:
+                    # Workers write their own output, so no markdown is sent back
+                    futures = {
+                        pool.submit(_convert_to_file, *job): job[0] for job in jobs
+                    }
+                    for future in as_completed(futures):
+                        try:
+                            future.result()
+                        except Exception as e:
+                            failures.append((futures[future], e))
+                        bar.update(1)
+
+        for input_file, error in failures:
+            click.echo(f"{input_file}: {error}", err=True)
+        converted = len(jobs) - len(failures)
+        if failures:
+            click.echo(
+                f"Converted {converted} of {len(jobs)} files, {len(failures)} failed",
+                err=True,
+            )
+            sys.exit(1)
+        click.echo(f"Converted {converted} files", err=True)
 
 
 def configure_tesseract() -> Path | None:
     """Find Tesseract and configure environment if found outside PATH."""
-    tesseract_path = find_tesseract()
-    if tesseract_path and sys.platform == "win32":
-        # If found but not in PATH, add to PATH for subprocess calls
-        tesseract_dir = str(tesseract_path.parent)
-        if tesseract_dir.lower() not in os.environ.get("PATH", "").lower():
-            os.environ["PATH"] = tesseract_dir + os.pathsep + os.environ.get("PATH", "")
-        # Set TESSDATA_PREFIX if not already set
-        tessdata_dir = tesseract_path.parent / "tessdata"
-        if tessdata_dir.exists() and "TESSDATA_PREFIX" not in os.environ:
-            os.environ["TESSDATA_PREFIX"] = str(tessdata_dir)
-    return tesseract_path
+    return _find_tesseract_early()
 
 
 def is_tesseract_installed() -> bool:
@@ -267,32 +646,39 @@ def is_tesseract_installed() -> bool:
     return find_tesseract() is not None
 
 
-@main.command()
-def check():
-    """Check if optional dependencies are installed."""
+def format_check_report() -> str:
+    """Describe which optional dependencies are installed, as printed by check."""
+    lines = []
     # Check Tesseract
-    # tesseract_path = find_tesseract()
+    # Reuses the lookup done at import time
     tesseract_path = _find_tesseract_early()
     if tesseract_path:
         in_path = shutil.which("tesseract") is not None
         status = "installed" if in_path else "installed (auto-configured)"
-        click.echo(f"Tesseract OCR: {status}")
-        click.echo(f"  Executable: {tesseract_path}")
+        lines.append(f"Tesseract OCR: {status}")
+        lines.append(f"  Executable: {tesseract_path}")
 
         # Show TESSDATA_PREFIX
         tessdata_prefix = os.environ.get("TESSDATA_PREFIX")
         if tessdata_prefix:
-            click.echo(f"  TESSDATA_PREFIX: {tessdata_prefix}")
+            lines.append(f"  TESSDATA_PREFIX: {tessdata_prefix}")
 
         # Check for tessdata and languages
         tessdata_dir = tesseract_path.parent / "tessdata"
         if tessdata_dir.exists():
             langs = sorted([p.stem for p in tessdata_dir.glob("*.traineddata")])
-            click.echo(f"  Languages ({len(langs)}): {', '.join(langs)}")
+            lines.append(f"  Languages ({len(langs)}): {', '.join(langs)}")
     else:
-        click.echo("Tesseract OCR: not found")
-        click.echo("  OCR for scanned PDFs will not be available.")
-        click.echo("  See: https://github.com/UB-Mannheim/tesseract/wiki")
+        lines.append("Tesseract OCR: not found")
+        lines.append("  OCR for scanned PDFs will not be available.")
+        lines.append("  See: https://github.com/UB-Mannheim/tesseract/wiki")
+    return "\n".join(lines)
+
+
+@main.command()
+def check():
+    """Check if optional dependencies are installed."""
+    click.echo(format_check_report())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,10 @@
+"""Filesystem helpers for tests."""
+
+import os
+from pathlib import Path
+
+
+def png_names(dir_: str | Path) -> frozenset[str]:
+    """Return the names of the PNG files directly inside dir_."""
+    with os.scandir(dir_) as entries:
+        return frozenset(e.name for e in entries if e.name.endswith(".png"))
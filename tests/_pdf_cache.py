@@ -0,0 +1,53 @@
+"""On-disk cache of pymupdf4llm conversions, keyed on PDF contents.
+
+Converting the sample PDF dominates the test suite's run time. Results are
+stored under pytest's cache directory, keyed on the SHA-256 of the PDF
+bytes plus the conversion options, so renaming or moving a PDF still hits
+the cache while editing it misses.
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+
+def compute_file_hash(path: str | Path) -> str:
+    """Return the SHA-256 hex digest of a file, read in 64 KB chunks."""
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def make_cached_to_markdown(
+    to_markdown: Callable, cache_dir: Path, version: str
+) -> Callable:
+    """Wrap to_markdown so repeated conversions are served from cache_dir.
+
+    ``version`` (the pymupdf4llm version) is part of the key so upgrades
+    invalidate old results. Conversions that write image files are never
+    cached, since their side effects are what the caller wants.
+    """
+
+    def cached_to_markdown(pdf_path, **kwargs):
+        if kwargs.get("write_images"):
+            return to_markdown(pdf_path, **kwargs)
+
+        key_source = f"{compute_file_hash(pdf_path)}:{version}:"
+        key_source += repr(sorted(kwargs.items()))
+        key = hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+        cache_file = cache_dir / f"{key}.json"
+        if cache_file.exists():
+            return json.loads(cache_file.read_text(encoding="utf-8"))["md"]
+
+        md = to_markdown(pdf_path, **kwargs)
+        # Write then rename, so a concurrent reader never sees a partial file
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps({"md": md}), encoding="utf-8")
+        os.replace(tmp_file, cache_file)
+        return md
+
+    return cached_to_markdown
@@ -0,0 +1,116 @@
+"""Shared fixtures for pdfcmds tests."""
+
+import os
+import shutil
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from _fsutil import png_names
+from _pdf_cache import make_cached_to_markdown
+from click.testing import CliRunner
+
+from pdfcmds.cli import _ensure_pymupdf, main
+
+DATA_DIR = Path(__file__).parent / "data"
+SAMPLE_PDF = DATA_DIR / "paper-with-figures.pdf"
+
+
+@pytest.fixture(scope="session")
+def pymupdf4llm():
+    """Activate pymupdf-layout and import pymupdf4llm once for the session.
+
+    Activation loads the layout model, so every test module shares this
+    fixture instead of activating at import time.
+    """
+    return _ensure_pymupdf()
+
+
+@pytest.fixture(scope="session")
+def cached_conversions(request, pymupdf4llm):
+    """Serve repeated pymupdf4llm conversions from an on-disk cache.
+
+    Results live in .pytest_cache, so they are reused across test runs.
+    """
+    cache = getattr(request.config, "cache", None)
+    if cache is None:  # cacheprovider plugin disabled
+        yield
+        return
+    cached_to_markdown = make_cached_to_markdown(
+        pymupdf4llm.to_markdown, cache.mkdir("pdfcmds"), pymupdf4llm.__version__
+    )
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(pymupdf4llm, "to_markdown", cached_to_markdown)
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _layout(request):
+    """Set up pymupdf4llm for every test not marked no_layout.
+
+    Workers that only run no_layout tests never load the layout model.
+    """
+    if request.node.get_closest_marker("no_layout") is None:
+        request.getfixturevalue("cached_conversions")
+
+
+def _copy_sample(dest_dir: Path) -> Path:
+    """Copy the sample PDF into dest_dir and return the copy's path.
+
+    pymupdf-layout may write images next to the PDF it converts, so tests
+    convert a private copy rather than the one in tests/data. The PDF is
+    never modified, so a hard link is used when the filesystem allows it.
+    """
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    dst = dest_dir / SAMPLE_PDF.name
+    try:
+        os.link(SAMPLE_PDF, dst)
+    except OSError:
+        shutil.copy2(SAMPLE_PDF, dst)
+    return dst
+
+
+def _convert_sample(
+    runner: CliRunner, pdf_path: Path, output_path: Path, *args: str
+) -> None:
+    """Convert pdf_path to output_path, failing on a non-zero exit."""
+    result = runner.invoke(
+        main,
+        ["convert", "--to", "markdown", str(pdf_path), "-o", str(output_path), *args],
+    )
+    assert result.exit_code == 0, f"Command failed: {result.output}"
+
+
+@pytest.fixture(scope="session")
+def runner():
+    """Create a CLI test runner, shared by all tests."""
+    return CliRunner()
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    """A copy of the sample PDF in the test's own temporary directory."""
+    return _copy_sample(tmp_path)
+
+
+@pytest.fixture(scope="session")
+def converted_bundle(runner, tmp_path_factory):
+    """Convert the sample PDF with --write-images once for the whole session.
+
+    Conversions that write images bypass the conversion cache, so the
+    image-extraction checks share this one. Returns a namespace with the
+    markdown text (md_text), the extracted image names (pngs) and the
+    directory of the converted PDF (pdf_dir).
+    """
+    bundle_dir = tmp_path_factory.mktemp("bundle")
+    pdf_path = _copy_sample(bundle_dir / "pdf")
+    md_path = bundle_dir / "output.md"
+    image_dir = bundle_dir / "images"
+    _convert_sample(
+        runner, pdf_path, md_path, "--write-images", "--image-dir", str(image_dir)
+    )
+    return SimpleNamespace(
+        md_text=md_path.read_text(encoding="utf-8"),
+        pngs=png_names(image_dir),
+        pdf_dir=pdf_path.parent,
+    )
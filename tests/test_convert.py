@@ -1,168 +1,124 @@
 """Tests for PDF conversion."""
 
-import os
-import tempfile
-from pathlib import Path
+import asyncio
+import subprocess
+import sys
 
 import pytest
-from click.testing import CliRunner
+from _fsutil import png_names
 
-from pdfcmds.cli import main
-
-DATA_DIR = Path(__file__).parent / "data"
-SAMPLE_PDF = DATA_DIR / "paper-with-figures.pdf"
-# Relative path from project root for testing relative path handling
-SAMPLE_PDF_RELATIVE = "tests/data/paper-with-figures.pdf"
-
-
-@pytest.fixture
-def runner():
-    """Create a CLI test runner."""
-    return CliRunner()
-
-
-@pytest.fixture(autouse=True)
-def cleanup_files():
-    """Clean up any files created during tests."""
-    yield
-    # pymupdf-layout writes images next to the PDF, so clean them up
-    for png in DATA_DIR.glob("*.png"):
-        png.unlink()
-    # Clean up default .md output files
-    default_md = DATA_DIR / "paper-with-figures.md"
-    if default_md.exists():
-        default_md.unlink()
+from pdfcmds import cli
+from pdfcmds.cli import (
+    _rewrite_and_move_images,
+    _rewrite_image_links,
+    convert_to_markdown,
+    convert_to_markdown_async,
+    find_tesseract,
+    format_check_report,
+    main,
+)
 
 
 class TestConvert:
     """Tests for the convert command."""
 
-    def test_convert_to_markdown_default_output(self, runner):
-        """Test converting PDF to markdown with default output file."""
-        result = runner.invoke(main, ["convert", "--to", "markdown", str(SAMPLE_PDF)])
-        assert result.exit_code == 0
-        # Check default output file was created
-        default_output = SAMPLE_PDF.with_suffix(".md")
-        assert default_output.exists()
-        content = default_output.read_text(encoding="utf-8")
-        assert len(content) > 0
+    @pytest.mark.parametrize(
+        ("args", "output_name"),
+        [([], "paper-with-figures.md"), (["-o", "{out}"], "output.md")],
+        ids=["default-output", "output-file"],
+    )
+    def test_convert_to_markdown_file(self, runner, sample_pdf, args, output_name):
+        """Test converting PDF to markdown output to file."""
+        # Default output is {input_stem}.md next to the PDF
+        output_path = sample_pdf.parent / output_name
+        args = [arg.format(out=output_path) for arg in args]
+        result = runner.invoke(
+            main, ["convert", "--to", "markdown", str(sample_pdf), *args]
+        )
+        assert result.exit_code == 0, f"Command failed: {result.output}"
+        assert output_path.exists()
+        assert output_path.stat().st_size > 0
 
-    def test_convert_to_markdown_stdout(self, runner):
+    def test_convert_to_markdown_stdout(self, runner, sample_pdf):
         """Test converting PDF to markdown with --stdout flag."""
         result = runner.invoke(
-            main, ["convert", "--to", "markdown", "--stdout", str(SAMPLE_PDF)]
+            main, ["convert", "--to", "markdown", "--stdout", str(sample_pdf)]
         )
-        assert result.exit_code == 0
-        # Output should be in stdout, not a file
+        assert result.exit_code == 0, f"Command failed: {result.output}"
+        # Output should be in stdout, and match the Python API
         assert len(result.output) > 0
+        assert result.output == convert_to_markdown(sample_pdf)
 
-    def test_convert_to_markdown_file(self, runner):
-        """Test converting PDF to markdown output to file."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = Path(tmpdir) / "output.md"
-            result = runner.invoke(
-                main,
-                [
-                    "convert",
-                    "--to",
-                    "markdown",
-                    str(SAMPLE_PDF),
-                    "-o",
-                    str(output_path),
-                ],
-            )
-            assert result.exit_code == 0
-            assert output_path.exists()
-            content = output_path.read_text(encoding="utf-8")
-            assert len(content) > 0
+    def test_convert_to_markdown_function(self, sample_pdf):
+        """Test converting PDF to markdown text without going through the CLI."""
+        md_text = convert_to_markdown(sample_pdf)
+        assert md_text.strip()
 
-    def test_convert_with_image_extraction(self, runner):
+    def test_convert_with_image_extraction(self, converted_bundle):
         """Test converting PDF to markdown with image extraction."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = Path(tmpdir) / "output.md"
-            image_dir = Path(tmpdir) / "images"
-            result = runner.invoke(
-                main,
-                [
-                    "convert",
-                    "--to",
-                    "markdown",
-                    str(SAMPLE_PDF),
-                    "-o",
-                    str(output_path),
-                    "--write-images",
-                    "--image-dir",
-                    str(image_dir),
-                ],
-            )
-            assert result.exit_code == 0
-            assert output_path.exists()
-            content = output_path.read_text(encoding="utf-8")
-            # Check that markdown contains image references
-            assert "![" in content, "Expected markdown to contain image references"
-            assert ".png" in content, "Expected markdown to reference PNG images"
-            # Verify images were extracted to the specified directory (not PDF directory)
-            image_files = list(image_dir.glob("*.png"))
-            assert len(image_files) > 0, "Expected at least one image in --image-dir"
-            # Verify no images were left in PDF directory (the bug we fixed)
-            pdf_dir_images = list(DATA_DIR.glob("*.png"))
-            assert len(pdf_dir_images) == 0, "Images should not be in PDF directory"
-
-    def test_convert_with_relative_path_and_images(self, runner):
+        content = converted_bundle.md_text
+        # Check that markdown contains image references
+        assert "![" in content, "Expected markdown to contain image references"
+        assert ".png" in content, "Expected markdown to reference PNG images"
+        # Verify images were extracted to the specified directory (not PDF directory)
+        assert converted_bundle.pngs, "Expected at least one image in --image-dir"
+        # Verify no images were left in PDF directory (the bug we fixed)
+        pdf_dir = converted_bundle.pdf_dir
+        assert not png_names(pdf_dir), "Images should not be in PDF directory"
+
+    def test_convert_with_relative_path_and_images(
+        self, runner, sample_pdf, tmp_path, monkeypatch
+    ):
         """Test converting PDF using relative path with image extraction.
 
         This test ensures that relative paths are handled correctly by pymupdf-layout.
         Previously, relative paths caused image save errors.
         """
-        # Change to project root so relative path is valid
-        project_root = DATA_DIR.parent.parent
-        original_cwd = os.getcwd()
-        try:
-            os.chdir(project_root)
-            with tempfile.TemporaryDirectory() as tmpdir:
-                output_path = Path(tmpdir) / "output.md"
-                result = runner.invoke(
-                    main,
-                    [
-                        "convert",
-                        "--to",
-                        "markdown",
-                        SAMPLE_PDF_RELATIVE,  # Use relative path
-                        "-o",
-                        str(output_path),
-                        "--write-images",
-                    ],
-                )
-                assert result.exit_code == 0, f"Command failed: {result.output}"
-                assert output_path.exists()
-        finally:
-            os.chdir(original_cwd)
-
-    def test_convert_with_embed_images(self, runner):
+        # Move the PDF into a subdirectory, so the relative path has a directory part
+        sample_dir = tmp_path / "sample_dir"
+        sample_dir.mkdir()
+        sample_pdf.rename(sample_dir / sample_pdf.name)
+        monkeypatch.chdir(tmp_path)
+        output_path = tmp_path / "output.md"
+        result = runner.invoke(
+            main,
+            [
+                "convert",
+                "--to",
+                "markdown",
+                f"sample_dir/{sample_pdf.name}",  # Use relative path
+                "-o",
+                str(output_path),
+                "--write-images",
+            ],
+        )
+        assert result.exit_code == 0, f"Command failed: {result.output}"
+        assert output_path.exists()
+
+    def test_convert_with_embed_images(self, runner, sample_pdf, tmp_path):
         """Test converting PDF to markdown with embedded base64 images."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = Path(tmpdir) / "output.md"
-            result = runner.invoke(
-                main,
-                [
-                    "convert",
-                    "--to",
-                    "markdown",
-                    str(SAMPLE_PDF),
-                    "-o",
-                    str(output_path),
-                    "--embed-images",
-                ],
-            )
-            assert result.exit_code == 0
-            assert output_path.exists()
-            content = output_path.read_text(encoding="utf-8")
-            # Check that markdown contains base64 embedded images
-            assert "data:image" in content, (
-                "Expected markdown to contain base64 embedded images"
-            )
+        output_path = tmp_path / "output.md"
+        result = runner.invoke(
+            main,
+            [
+                "convert",
+                "--to",
+                "markdown",
+                str(sample_pdf),
+                "-o",
+                str(output_path),
+                "--embed-images",
+            ],
+        )
+        assert result.exit_code == 0
+        assert output_path.exists()
+        content = output_path.read_text(encoding="utf-8")
+        # Check that markdown contains base64 embedded images
+        assert "data:image" in content, (
+            "Expected markdown to contain base64 embedded images"
+        )
 
-    def test_write_and_embed_images_mutually_exclusive(self, runner):
+    def test_write_and_embed_images_mutually_exclusive(self, runner, sample_pdf):
         """Test that --write-images and --embed-images cannot be used together."""
         result = runner.invoke(
             main,
@@ -170,7 +126,7 @@ class TestConvert:
                 "convert",
                 "--to",
                 "markdown",
-                str(SAMPLE_PDF),
+                str(sample_pdf),
                 "--write-images",
                 "--embed-images",
             ],
@@ -179,11 +135,223 @@ class TestConvert:
         assert "mutually exclusive" in result.output
 
 
+class TestConvertBatch:
+    """Tests for the convert-batch command."""
+
+    def test_convert_batch_to_output_dir(self, runner, sample_pdf, tmp_path):
+        """Test converting several PDFs in one invocation."""
+        input_dir = tmp_path / "in"
+        input_dir.mkdir()
+        for name in ("a.pdf", "b.pdf"):
+            (input_dir / name).write_bytes(sample_pdf.read_bytes())
+        output_dir = tmp_path / "out"
+        result = runner.invoke(
+            main,
+            [
+                "convert-batch",
+                "--to",
+                "markdown",
+                "--glob",
+                str(input_dir / "*.pdf"),
+                "--output-dir",
+                str(output_dir),
+                "--workers",
+                "2",
+            ],
+        )
+        assert result.exit_code == 0, f"Command failed: {result.output}"
+        for stem in ("a", "b"):
+            output_path = output_dir / f"{stem}.md"
+            assert output_path.exists()
+            assert len(output_path.read_text(encoding="utf-8")) > 0
+
+    @pytest.mark.parametrize("workers", ["1", "2"])
+    def test_convert_batch_reports_failures(
+        self, runner, sample_pdf, tmp_path, workers
+    ):
+        """Test that a file that fails to convert does not stop the batch."""
+        good = tmp_path / "good.pdf"
+        good.write_bytes(sample_pdf.read_bytes())
+        bad = tmp_path / "bad.pdf"
+        bad.write_bytes(b"not a pdf")
+        result = runner.invoke(
+            main,
+            [
+                "convert-batch",
+                "--to",
+                "markdown",
+                str(bad),
+                str(good),
+                "--workers",
+                workers,
+            ],
+        )
+        assert result.exit_code == 1
+        assert f"{bad}: " in result.output
+        assert "Converted 1 of 2 files, 1 failed" in result.output
+        assert (tmp_path / "good.md").stat().st_size > 0
+        assert not (tmp_path / "bad.md").exists()
+
+    def test_convert_batch_rejects_output_collisions(
+        self, runner, sample_pdf, tmp_path
+    ):
+        """Test that inputs with the same stem cannot share an output file."""
+        inputs = [tmp_path / "a" / "x.pdf", tmp_path / "b" / "x.pdf"]
+        for input_file in inputs:
+            input_file.parent.mkdir()
+            input_file.write_bytes(sample_pdf.read_bytes())
+        output_dir = tmp_path / "out"
+        result = runner.invoke(
+            main,
+            [
+                "convert-batch",
+                "--to",
+                "markdown",
+                *map(str, inputs),
+                "--output-dir",
+                str(output_dir),
+            ],
+        )
+        assert result.exit_code != 0
+        assert "would both be converted to" in result.output
+        assert not (output_dir / "x.md").exists()
+
+    def test_convert_batch_requires_inputs(self, runner, tmp_path):
+        """Test that convert-batch fails when no PDFs are selected."""
+        result = runner.invoke(
+            main,
+            [
+                "convert-batch",
+                "--to",
+                "markdown",
+                "--glob",
+                str(tmp_path / "*.pdf"),
+            ],
+        )
+        assert result.exit_code != 0
+        assert "No input files" in result.output
+
+
+class TestConvertAsync:
+    """Tests for the async conversion helper."""
+
+    def test_convert_to_markdown_async(self, sample_pdf):
+        """Test converting PDF to markdown from a coroutine."""
+        md_text = asyncio.run(convert_to_markdown_async(sample_pdf))
+        assert len(md_text) > 0
+
+
+@pytest.mark.no_layout
+class TestImageLinks:
+    """Tests for markdown image link rewriting."""
+
+    @pytest.mark.parametrize(
+        "md_text, expected",
+        [
+            ("![fig](a.png)", "![fig](A.PNG)"),
+            ("text ![](a.png) and ![x](b.png)", "text ![](A.PNG) and ![x](B.PNG)"),
+            ("![a ![b](c.png)", "![a ![b](C.PNG)"),
+            ("![not] a link (x)", "![not] a link (x)"),
+            ("![empty]() ![ok](d.png)", "![empty]() ![ok](D.PNG)"),
+            ("[link](e.png) ![unclosed](f.png", "[link](e.png) ![unclosed](f.png"),
+            ("![two\nlines](g.png)", "![two\nlines](g.png)"),
+            ("![split](h\n.png) ![ok](i.png)", "![split](h\n.png) ![ok](I.PNG)"),
+        ],
+    )
+    def test_rewrite_image_links(self, md_text, expected):
+        """Test that only image link paths are rewritten."""
+        assert _rewrite_image_links(md_text, str.upper) == expected
+
+
+@pytest.mark.no_layout
+class TestMoveImages:
+    """Tests for the misplaced-image workaround."""
+
+    def test_rewrite_and_move_images(self, tmp_path):
+        """Test that only new images named after the input are moved."""
+        pdf_dir = tmp_path / "pdf"
+        image_dir = tmp_path / "images"
+        pdf_dir.mkdir()
+        image_dir.mkdir()
+        names = (
+            "old.png",
+            "a.pdf-0001-01.png",
+            "b.pdf-0001-01.png",
+            # Belongs to "a.pdf-x.pdf", despite starting with "a.pdf-"
+            "a.pdf-x.pdf-0001-01.png",
+        )
+        for name in names:
+            (pdf_dir / name).write_bytes(b"")
+        pages = [f"![]({pdf_dir / 'a.pdf-0001-01.png'})"]
+
+        pages = _rewrite_and_move_images(
+            pdf_dir, image_dir, None, pages, {"old.png"}, "a.pdf"
+        )
+
+        assert pages == [f"![]({image_dir / 'a.pdf-0001-01.png'})"]
+        assert sorted(p.name for p in image_dir.iterdir()) == ["a.pdf-0001-01.png"]
+        assert sorted(p.name for p in pdf_dir.iterdir()) == [
+            "a.pdf-x.pdf-0001-01.png",
+            "b.pdf-0001-01.png",
+            "old.png",
+        ]
+
+    def test_rewrite_and_move_images_relative(self, tmp_path):
+        """Test that absolute image paths become relative and others are kept."""
+        pdf_dir = tmp_path / "pdf"
+        image_dir = tmp_path / "out" / "images"
+        image_dir.mkdir(parents=True)
+        pdf_dir.mkdir()
+        (pdf_dir / "a.pdf-0001-01.png").write_bytes(b"")
+        pages = [
+            f"![]({pdf_dir / 'a.pdf-0001-01.png'})",
+            f"![]({(image_dir / 'a.pdf-0002-01.png').as_posix()})",
+            f"![]({pdf_dir / 'c.png'})",
+            "![](b.png)",
+        ]
+
+        pages = _rewrite_and_move_images(
+            pdf_dir, image_dir, image_dir.parent, pages, set(), "a.pdf"
+        )
+
+        assert pages == [
+            "![](images/a.pdf-0001-01.png)",
+            "![](images/a.pdf-0002-01.png)",
+            f"![]({pdf_dir / 'c.png'})",
+            "![](b.png)",
+        ]
+
+
+@pytest.mark.no_layout
 class TestCheck:
     """Tests for the check command."""
 
-    def test_check_runs(self, runner):
-        """Test that check command runs without error."""
-        result = runner.invoke(main, ["check"])
-        assert result.exit_code == 0
-        assert "Tesseract OCR:" in result.output
+    def test_check_report(self):
+        """Test that the check report covers Tesseract."""
+        assert "Tesseract OCR:" in format_check_report()
+
+    def test_import_skips_pymupdf(self):
+        """Test that importing the CLI leaves pymupdf4llm unloaded until needed."""
+        code = "import sys, pdfcmds.cli; sys.exit('pymupdf4llm' in sys.modules)"
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_find_tesseract_is_cached(self):
+        """Test that repeated Tesseract lookups reuse the first result."""
+        cli._reset_for_tests()
+        tesseract_path = cli._find_tesseract_early()
+        assert cli._find_tesseract_early() == tesseract_path
+        assert find_tesseract() == tesseract_path
+        assert find_tesseract.cache_info().misses == 1
+
+    def test_find_windows_tesseract(self, monkeypatch, tmp_path):
+        """Test that the first existing Windows install location is returned."""
+        candidates = [
+            tmp_path / "missing" / "tesseract.exe",
+            tmp_path / "Tesseract-OCR" / "tesseract.exe",
+            tmp_path / "Tesseract-OCR" / "other.exe",
+        ]
+        candidates[1].parent.mkdir()
+        candidates[1].write_bytes(b"")
+        candidates[2].write_bytes(b"")
+        monkeypatch.setattr(cli, "WINDOWS_TESSERACT_PATHS", candidates)
+        assert cli._find_windows_tesseract() == candidates[1]